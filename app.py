@@ -8,7 +8,7 @@ from settings.settings import load_settings, get_setting
 from solver.solver import Solver
 
 # Base directory for resolving paths
-file.STARTING_PATH = Path(__file__).resolve()
+file.set_starting_path(Path(__file__).resolve())
 
 
 def process_game_board():
@@ -24,10 +24,10 @@ def process_game_board():
     # Step 2: Capture the screenshot of the selected area
     print("\nStep 2: Capture the grid area screenshot.")
     screenshot_path = resolve_path(get_setting("paths.screenshot_img"))
-    capture_screenshot_of_grid(grid_area, save_path=screenshot_path)
+    screenshot = capture_screenshot_of_grid(grid_area, save_path=screenshot_path)
 
-    # Step 3: Pass grid_area (x, y, w, h) to the function
-    board_obj = detect_game_board(screenshot_path, grid_area, save_intermediate=True)
+    # Step 3: Pass the screenshot and grid_area (x, y, w, h) to the function
+    board_obj = detect_game_board(screenshot, grid_area, save_intermediate=True)
 
     # Step 4: Solve the game board
     solver = Solver(board_obj)
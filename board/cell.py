@@ -1,8 +1,20 @@
 import numpy as np
 
+# Cell states in toggle order: empty -> cross -> crown -> empty
+STATES = ["empty", "cross", "crown"]
+
+# State ids, the index of each state in STATES
+EMPTY, CROSS, CROWN = range(len(STATES))
+
 
 class Cell:
-    def __init__(self, x, y, size):
+    __slots__ = ("x", "y", "size", "color", "state_id", "row_ref", "column_ref", "area_ref")
+
+    EMPTY = EMPTY
+    CROSS = CROSS
+    CROWN = CROWN
+
+    def __init__(self, x, y, size, state=EMPTY):
         """
         Initializes a Cell object.
 
@@ -10,12 +22,13 @@ class Cell:
             x (int): The x-coordinate of the cell's center.
             y (int): The y-coordinate of the cell's center.
             size (int): The size of the square cell (both width and height).
+            state (int): The initial state id (Cell.EMPTY, Cell.CROSS or Cell.CROWN).
         """
         self.x = x
         self.y = y
         self.size = size
         self.color = None  # Optional: Store cell color
-        self.state = "empty"  # "empty", "crown", or "cross"
+        self.state_id = state  # EMPTY, CROSS or CROWN
 
         self.row_ref = None  # Reference to the Row object
         self.column_ref = None  # Reference to the Column object
@@ -55,6 +68,33 @@ class Cell:
         y_center = top_left[1] + size // 2
         return cls(x_center, y_center, size)
 
+    @property
+    def state(self):
+        """
+        The state name of the cell ("empty", "cross", or "crown").
+        """
+        return STATES[self.state_id]
+
+    @state.setter
+    def state(self, new_state):
+        self.state_id = STATES.index(new_state)
+
+    def __setstate__(self, pickled_state):
+        """
+        Restores a pickled cell, including cells pickled before the state id was introduced.
+
+        Args:
+            pickled_state (dict or tuple): The pickled attributes, as a dict (older pickles)
+                or a (None, slots dict) tuple.
+        """
+        if isinstance(pickled_state, tuple):
+            pickled_state = pickled_state[1]
+        pickled_state = dict(pickled_state)
+        if "state" in pickled_state:
+            pickled_state["state_id"] = STATES.index(pickled_state.pop("state"))
+        for name, value in pickled_state.items():
+            setattr(self, name, value)
+
     def is_empty(self):
         """
         Checks if the cell is in an empty state.
@@ -62,7 +102,7 @@ class Cell:
         Returns:
             bool: True if the cell state is "empty", False otherwise.
         """
-        return self.state == "empty"
+        return self.state_id == EMPTY
 
     def is_cross(self):
         """
@@ -71,7 +111,7 @@ class Cell:
         Returns:
             bool: True if the cell state is "cross", False otherwise.
         """
-        return self.state == "cross"
+        return self.state_id == CROSS
 
     def is_crown(self):
         """
@@ -80,7 +120,7 @@ class Cell:
         Returns:
             bool: True if the cell state is "crown", False otherwise.
         """
-        return self.state == "crown"
+        return self.state_id == CROWN
 
     def set_color(self, color):
         """
@@ -103,21 +143,28 @@ class Cell:
         Args:
             new_state (str): The new state ("empty", "cross", or "crown").
         """
-        if new_state not in ["empty", "cross", "crown"]:
+        if new_state not in STATES:
             raise ValueError("Invalid state. Allowed values: 'empty', 'cross', 'crown'.")
 
-        self.state = new_state
+        self.state_id = STATES.index(new_state)
 
     def toggle_state(self):
         """
         Toggles the state of the cell in the order: empty -> cross -> crown -> empty.
         """
-        if self.is_empty():
-            self.set_state("cross")
-        elif self.is_cross():
-            self.set_state("crown")
-        elif self.is_crown():
-            self.set_state("empty")
+        self.state_id = (self.state_id + 1) % len(STATES)
+
+    def toggles_to(self, target_state):
+        """
+        Returns the number of toggles needed to move from the current state to the target state.
+
+        Args:
+            target_state (str): The state to reach ("empty", "cross", or "crown").
+
+        Returns:
+            int: 0, 1 or 2 toggles, following the empty -> cross -> crown -> empty cycle.
+        """
+        return (STATES.index(target_state) - self.state_id) % len(STATES)
 
     def get_coordinates(self):
         """
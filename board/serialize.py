@@ -0,0 +1,53 @@
+import numpy as np
+
+from board.board import Board
+from board.cell import Cell
+
+# Color value stored for cells without a color
+NO_COLOR = -1
+
+
+def save_board_npz(file_path, board):
+    """
+    Saves a board to a NumPy .npz file as a few compact arrays (states, colors and cell geometry).
+
+    Args:
+        file_path (str or Path): The path of the .npz file.
+        board (Board): The board to save.
+    """
+    cells = [cell for row in board.cells for cell in row]
+    rows, cols = board.get_dimensions()
+
+    states = np.array([cell.state_id for cell in cells], dtype=np.int8).reshape(rows, cols)
+    colors = np.array([cell.color if cell.color is not None else (NO_COLOR,) * 3 for cell in cells],
+                      dtype=np.int16).reshape(rows, cols, 3)
+    geometry = np.array([(cell.x, cell.y, cell.size) for cell in cells], dtype=np.int32).reshape(rows, cols, 3)
+
+    np.savez(file_path, states=states, colors=colors, geometry=geometry,
+             top_left=np.array(board.top_left, dtype=np.int32))
+
+
+def load_board_npz(file_path):
+    """
+    Loads a board saved with `save_board_npz`.
+
+    Args:
+        file_path (str or Path): The path of the .npz file.
+
+    Returns:
+        Board: A new board with the saved cells, colors and states.
+    """
+    with np.load(file_path) as data:
+        states = data["states"].ravel().tolist()
+        colors = data["colors"].reshape(-1, 3).tolist()
+        geometry = data["geometry"].reshape(-1, 3).tolist()
+        top_left = tuple(data["top_left"].tolist())
+
+    cells = []
+    for (x, y, size), color, state_id in zip(geometry, colors, states):
+        cell = Cell(x, y, size, state=state_id)
+        if color[0] != NO_COLOR:
+            cell.set_color(tuple(color))
+        cells.append(cell)
+
+    return Board(top_left, cells)
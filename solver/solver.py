@@ -1,14 +1,18 @@
 import math
 import pickle
 import time
-from collections import defaultdict
+from collections import Counter
+from itertools import chain
+from pathlib import Path
 from typing import Dict, List, Any
 
+import numpy as np
 from pynput import keyboard
 
 from board.area import Area
-from board.cell import Cell
+from board.cell import Cell, EMPTY
 from board.line import Row, Column, Line
+from board.serialize import save_board_npz
 from settings.settings import get_setting
 from utils.input import click_at, click_and_drag
 from utils.logic import find_matching_entries
@@ -27,19 +31,16 @@ def get_common_cells(sets_of_cells: list[set[Cell]]) -> list[Cell]:
     if not sets_of_cells:
         return []  # Return an empty list if there are no sets
 
-    # Start with the first set and intersect with the rest
-    common_cells = sets_of_cells[0]
-
-    # Perform intersection with all subsequent sets
-    for cell_set in sets_of_cells[1:]:
-        common_cells &= cell_set
-
-    return list(common_cells)
+    # Intersect all sets in a single call, starting from the smallest set to minimize lookups
+    smallest, *others = sorted(sets_of_cells, key=len)
+    if not smallest:
+        return []  # An empty set leaves nothing in common
+    return list(smallest.intersection(*others))
 
 
 def save_board_state(board, filename=None):
     """
-    Saves the current state of the board to a file.
+    Saves the current state of the board to a file. `.npz` files are saved as arrays, other files as pickles.
 
     Args:
         board: The board object to save.
@@ -48,8 +49,11 @@ def save_board_state(board, filename=None):
     if filename is None:
         filename = get_setting("paths.board_obj")
     try:
-        with open(filename, "wb") as file:
-            pickle.dump(board, file)
+        if Path(filename).suffix == ".npz":
+            save_board_npz(filename, board)
+        else:
+            with open(filename, "wb") as file:
+                pickle.dump(board, file)
         print(f"Board state saved to {filename}")
     except Exception as e:
         print(f"Error saving board state: {e}")
@@ -70,8 +74,22 @@ class Solver:
         self.areas: Dict[Any, Area] = {}  # Dictionary to store areas by color (str -> Area)
         self.rows: List[Row] = []  # List to store Row objects
         self.columns: List[Column] = []  # List to store Column objects
+        self._all_lines: List[Line] = []  # Rows followed by columns
+        self.line_areas: Dict[Line, Counter] = {}  # Empty cells per area in each line (Line -> {Area: count})
+        self.area_empty_count: Dict[Area, int] = {}  # Number of empty cells in each area
+        self._areas_by_empty: List[Area] | None = None  # Areas sorted by empty cells, None when outdated
+        self._mask_cells: List[Cell] = []  # Cells by bit index in the board masks
+        self._cell_bits: Dict[Cell, int] = {}  # Bit of each cell in the board masks
+        self._rule4_masks: Dict[Cell, int] = {}  # Cells sharing a line or touching each cell, as a mask
+        self._crown_neighborhood: Dict[Cell, frozenset[Cell]] = {}  # Cells to cross when each cell is crowned
+        self.empty_mask = 0  # Mask of the empty cells of the board
+        self._cell_positions: Dict[Cell, tuple[int, int]] = {}  # (row, col) of each cell
+        self.states: np.ndarray | None = None  # State ids of the cells (EMPTY, CROSS or CROWN), as a (rows, cols) array
+        self.area_ids: np.ndarray | None = None  # Area index of the cells (-1 without area), as a (rows, cols) array
+        self._area_masks: np.ndarray | None = None  # Cells of each area, as an (areas, rows, cols) boolean array
         self.crowns = 0
         self.guess_flag = False
+        self._trail: List[tuple[Cell, int]] = []  # Cell states changed while guessing (cell, previous state id)
 
         self.click_cross_enabled = get_setting("app_settings.click_cross_enabled")
         self.click_crown_enabled = get_setting("app_settings.click_crown_enabled")
@@ -144,16 +162,127 @@ class Solver:
             column = Column(index=col_index, cells=cells_in_column)
             self.columns.append(column)
 
+        self._all_lines = self.rows + self.columns
+        self.index_state_arrays()
+        self.index_cell_masks()
+        self.index_empty_counts()
+
         print(f"Lines created: {len(self.rows)} rows and {len(self.columns)} columns.")
 
+    def index_state_arrays(self):
+        """
+        Builds the (rows, cols) arrays holding the state id and the area index of every cell.
+        """
+        area_indexes = {area: index for index, area in enumerate(self.areas.values())}
+        self._cell_positions = {cell: (row.index, col_index)
+                                for row in self.rows for col_index, cell in enumerate(row.cells)}
+        self.states = np.array([[cell.state_id for cell in row.cells] for row in self.rows],
+                               dtype=np.int8)
+        self.area_ids = np.array([[area_indexes.get(cell.area_ref, -1) for cell in row.cells] for row in self.rows],
+                                 dtype=np.int16)
+        self._area_masks = self.area_ids == np.arange(len(area_indexes))[:, None, None]
+
+    def index_cell_masks(self):
+        """
+        Assigns a bit to every cell of the board and precomputes, for each cell, the mask of the cells
+        in its row, its column and its surroundings (excluding the cell itself), as well as the cells
+        to cross when it gets a crown (the same cells plus the rest of its area).
+        """
+        self._mask_cells = [cell for row in self.rows for cell in row.cells]
+        self._cell_bits = {cell: 1 << index for index, cell in enumerate(self._mask_cells)}
+        self._rule4_masks = {}
+        self._crown_neighborhood = {}
+        for cell in self._mask_cells:
+            neighbours = (self.board.get_surrounding_cells(cell) +
+                          cell.row_ref.get_line_except_cell(cell) +
+                          cell.column_ref.get_line_except_cell(cell))
+            mask = 0
+            for neighbour in neighbours:
+                mask |= self._cell_bits[neighbour]
+            self._rule4_masks[cell] = mask
+
+            area_cells = cell.area_ref.get_area_except_cell(cell) if cell.area_ref else []
+            self._crown_neighborhood[cell] = frozenset(neighbours + area_cells)
+
+    def cells_from_mask(self, mask):
+        """
+        Returns the cells whose bits are set in the given mask.
+
+        Args:
+            mask (int): A mask built from the cell bits.
+
+        Returns:
+            List[Cell]: The cells in the mask, in board order.
+        """
+        cells = []
+        while mask:
+            lowest_bit = mask & -mask
+            cells.append(self._mask_cells[lowest_bit.bit_length() - 1])
+            mask ^= lowest_bit
+        return cells
+
+    def index_empty_counts(self):
+        """
+        Counts the empty cells of every area and, for every row and column, the empty cells
+        that belong to each area.
+        """
+        self.line_areas = {line: Counter(cell.area_ref for cell in line.get_empty_cells())
+                           for line in self._all_lines}
+        self.area_empty_count = {area: len(area.get_empty_cells()) for area in self.areas.values()}
+        self._areas_by_empty = None
+        self.empty_mask = 0
+        for cell in self._mask_cells:
+            if cell.state_id == EMPTY:
+                self.empty_mask |= self._cell_bits[cell]
+
+    def update_empty_counts(self, cell, was_empty):
+        """
+        Updates the state array and the empty cell counts of the cell's row, column and area after a state change.
+
+        Args:
+            cell (Cell): The cell whose state changed.
+            was_empty (bool): Whether the cell was empty before the change.
+        """
+        self.states[self._cell_positions[cell]] = cell.state_id
+
+        if was_empty == (cell.state_id == EMPTY):
+            return
+
+        self.empty_mask ^= self._cell_bits[cell]
+
+        for line in (cell.row_ref, cell.column_ref):
+            areas = self.line_areas[line]
+            if was_empty:
+                areas[cell.area_ref] -= 1
+                if not areas[cell.area_ref]:
+                    del areas[cell.area_ref]  # Keep only areas with empty cells in the line
+            else:
+                areas[cell.area_ref] += 1
+
+        if cell.area_ref is not None:
+            self.area_empty_count[cell.area_ref] += -1 if was_empty else 1
+            self._areas_by_empty = None
+
+    def get_areas_by_empty_count(self):
+        """
+        Returns the areas sorted by their number of empty cells (ascending).
+        The order is cached until a cell changes from or to empty.
+
+        Returns:
+            List[Area]: The areas, from fewest to most empty cells.
+        """
+        if self._areas_by_empty is None:
+            self._areas_by_empty = sorted(self.areas.values(), key=self.area_empty_count.get)
+        return self._areas_by_empty
+
     def set_cell_crown(self, cell):
         """
         Toggles the cell's state until it is set to 'crown'.
         """
         self.crowns = self.crowns + 1
         click = get_setting("app_settings.click_crown_enabled")
-        while not cell.is_crown():
-            duration = get_setting("app_settings.click_crown_duration")
+        duration = get_setting("app_settings.click_crown_duration")
+        for _ in range(cell.toggles_to("crown")):
             self.toggle_cell(cell, click, duration)
 
     def set_cell_cross(self, cell, click=None):
@@ -162,8 +291,8 @@ class Solver:
         """
         if click is None:
             click = get_setting("app_settings.click_cross_enabled")
-        while not cell.is_cross():
-            duration = get_setting("app_settings.click_cross_duration")
+        duration = get_setting("app_settings.click_cross_duration")
+        for _ in range(cell.toggles_to("cross")):
             self.toggle_cell(cell, click, duration)
 
     def toggle_cell(self, cell, click=True, duration=None):
@@ -171,7 +300,11 @@ class Solver:
             Toggles the cell's state and clicks it on screen if click is true.
         """
         x, y = self.board.get_cell_coordinates(cell)
+        was_empty = cell.state_id == EMPTY
+        if self.guess_flag:
+            self._trail.append((cell, cell.state_id))
         cell.toggle_state()
+        self.update_empty_counts(cell, was_empty)
 
         # Click the screen
         if click and self.click_enabled and not self.stop_flag:
@@ -179,6 +312,25 @@ class Solver:
                 duration = get_setting("app_settings.click_cross_duration")
             click_at((x, y), duration)
 
+    def _mark(self):
+        """
+        Returns the current position in the trail, to be restored later with `_restore`.
+        """
+        return len(self._trail)
+
+    def _restore(self, mark):
+        """
+        Reverts every cell state change recorded in the trail after the given mark.
+
+        Args:
+            mark (int): A trail position returned by `_mark`.
+        """
+        while len(self._trail) > mark:
+            cell, state_id = self._trail.pop()
+            was_empty = cell.state_id == EMPTY
+            cell.state_id = state_id
+            self.update_empty_counts(cell, was_empty)
+
     def click_and_drag_cells(self, cells: list[Cell]):
         # Change state of cells to crossed without clicking
         for cell in cells:
@@ -206,7 +358,7 @@ class Solver:
             raise TypeError("All elements in the 'cells' list must be instances of the 'Cell' class.")
 
         # Filter any cell that isn't empty
-        cells_to_cross = [cell for cell in cells_to_cross if cell.is_empty()]
+        cells_to_cross = [cell for cell in cells_to_cross if cell.state_id == EMPTY]
 
         # If clicking is not enable, we only change states
         click_cross_enabled = get_setting("app_settings.click_cross_enabled")
@@ -217,15 +369,11 @@ class Solver:
             return
 
         while cells_to_cross:
-            # Organize cells in lines (Rows and Columns)
-            lines = defaultdict(int)  # This will store the counts of each line (Row or Column)
-
-            for cell in cells_to_cross:
-                lines[cell.row_ref] += 1  # Count the row
-                lines[cell.column_ref] += 1  # Count the column
+            # Organize cells in lines (Rows and Columns), counting the cells of each line
+            lines = Counter(chain.from_iterable((cell.row_ref, cell.column_ref) for cell in cells_to_cross))
 
             # Order lines from biggest to smallest
-            lines = sorted(lines.items(), key=lambda item: item[1], reverse=True)
+            lines = lines.most_common()
 
             # Split lines into segments
             segments = []
@@ -263,15 +411,7 @@ class Solver:
         return [cell for area in self.areas.values() for cell in area.get_empty_cells()]
 
     def get_crosses_from_crown(self, crown):
-        col: Column = crown.column_ref
-        row: Row = crown.row_ref
-        area: Area = crown.area_ref
-        return list(set(
-            col.get_line_except_cell(crown) +
-            row.get_line_except_cell(crown) +
-            area.get_area_except_cell(crown) +
-            self.board.get_surrounding_cells(crown)
-        ))
+        return list(self._crown_neighborhood[crown])
 
     def rule_one(self):
         """
@@ -294,7 +434,7 @@ class Solver:
 
         # Check for crowns in lines (rows and columns)
         if not crown:
-            for line in self.rows + self.columns:
+            for line in self._all_lines:
                 crown = line.check_empty_spot()
                 if crown:
                     break
@@ -341,8 +481,9 @@ class Solver:
                 # Get all cells in the row
                 line_cells = line.cells
                 # Keep empty cells that don't belong to the area
+                area_empty_set = set(area_empty_cells)
                 crosses = [cell for cell in line_cells if
-                           cell not in area_empty_cells and cell.is_empty()]
+                           cell not in area_empty_set and cell.state_id == EMPTY]
 
         return crown, crosses
 
@@ -355,25 +496,18 @@ class Solver:
         crown: Cell | None = None
         crosses: list[Cell] = []
 
-        # Step 1: Check all rows and columns
-        for line in self.rows + self.columns:  # Combine rows and columns into one iterable
-            line_empty_cells = line.get_empty_cells()
-
-            if not line_empty_cells:  # Skip if no empty cells in this line
-                continue
-
-            # Step 2: Check if all empty cells belong to the same area
-            areas_in_line = set(cell.area_ref for cell in line_empty_cells)
-
+        # Step 1: Check all rows and columns for empty cells belonging to a single area
+        for line, areas_in_line in self.line_areas.items():
             if len(areas_in_line) == 1:  # Only one area in this line
                 area = next(iter(areas_in_line))  # Get the single area reference
+                line_empty_set = set(line.get_empty_cells())
 
-                # Step 3: Get all empty cells in the area
+                # Step 2: Get all empty cells in the area
                 area_empty_cells = area.get_empty_cells()
 
-                # Step 4: Remove the line's empty cells from the area's empty cells
+                # Step 3: Remove the line's empty cells from the area's empty cells
                 crosses = [cell for cell in area_empty_cells if
-                           cell not in line_empty_cells]
+                           cell not in line_empty_set]
                 break
 
         return crown, crosses
@@ -387,34 +521,22 @@ class Solver:
         crown: Cell | None = None
         crosses: list[Cell] = []
 
-        # Step 1: Sort areas by the number of empty spaces (ascending)
-        areas_by_empty_cells = sorted(self.areas.values(), key=lambda a: len(a.get_empty_cells()))
-
-        # Step 2: Iterate through each area
-        for area in areas_by_empty_cells:
-            empty_cells = area.get_empty_cells()
-
+        # Step 1: Iterate through areas sorted by the number of empty spaces (ascending)
+        for area in self.get_areas_by_empty_count():
             # Skip areas with no empty cells or only one empty cell
-            if len(empty_cells) < 2:
+            if self.area_empty_count[area] < 2:
                 continue
 
-            # Step 3: Collect surrounding cells AND lines for all empty cells
-            surrounding_cells_list = []
-            for cell in empty_cells:
-                surrounding_cells = set(self.board.get_surrounding_cells(cell))
-                row_cells = set(cell.row_ref.get_line_except_cell(cell))
-                column_cells = set(cell.column_ref.get_line_except_cell(cell))
-                surrounding_cells_list.append(
-                    surrounding_cells | row_cells | column_cells)
-
-            # Step 4: Intersect all surrounding cells
-            common_cells = get_common_cells(surrounding_cells_list)
+            # Step 2: Get the empty cells of the area
+            empty_cells = area.get_empty_cells()
 
-            # Step 5: Keep only the empty cells
-            common_cells = [cell for cell in common_cells if cell.is_empty()]
+            # Step 3: Intersect the surrounding cells AND lines of all empty cells, keeping only empty cells
+            common_mask = self.empty_mask
+            for cell in empty_cells:
+                common_mask &= self._rule4_masks[cell]
 
-            # Step 6: Cross the common cells that are empty
-            crosses.extend(common_cells)
+            # Step 4: Cross the common cells that are empty
+            crosses.extend(self.cells_from_mask(common_mask))
 
         return crown, crosses
 
@@ -442,28 +564,34 @@ class Solver:
         min_value = 2
         max_value = math.ceil(len(self.areas) / 2)
 
-        def process_line(areas_dictionary, get_lines_of_empty_cells):
+        empty = self.states == EMPTY
+        area_empty_cells = empty & self._area_masks  # (areas, rows, cols): empty cells of each area
+
+        def process_line(axis):
             nonlocal min_value, max_value
+            # Indexes of the lines (rows for axis 1, columns for axis 0) holding empty cells of each area
+            areas_dictionary = {}
+            for area_id, lines_with_empty in enumerate(area_empty_cells.any(axis=axis + 1).tolist()):
+                line_indexes = [index for index, has_empty in enumerate(lines_with_empty) if has_empty]
+                if line_indexes:
+                    areas_dictionary[area_id] = line_indexes
+
             for i in range(min_value, max_value + 1):
                 matching_areas = find_matching_entries(areas_dictionary, i)
                 if matching_areas:
-                    matching_lines: set[Line] = set(
-                        line for area in matching_areas for line in get_lines_of_empty_cells(area))
-                    all_cells = set(
-                        cell for matching_line in matching_lines for cell in matching_line.get_empty_cells())
-                    cells_to_cross = [cell for cell in all_cells if cell.area_ref not in matching_areas]
+                    matching_lines = np.zeros(empty.shape[1 - axis], dtype=bool)
+                    matching_lines[[index for area_id in matching_areas for index in areas_dictionary[area_id]]] = True
+                    in_matching_lines = matching_lines[:, None] if axis == 1 else matching_lines[None, :]
+                    # Empty cells of the matching lines that belong to other areas
+                    cross_mask = empty & in_matching_lines & ~self._area_masks[matching_areas].any(axis=0)
+                    cells_to_cross = [self._mask_cells[index] for index in np.flatnonzero(cross_mask)]
                     crosses.extend(cells_to_cross)
                     if cells_to_cross:
                         break
 
-        # Apply rule for areas
-        areas_rows = {area: rows for area, rows in
-                      ((area, area.get_rows_of_empty_cells()) for area in self.areas.values()) if rows}
-        areas_columns = {area: columns for area, columns in
-                         ((area, area.get_columns_of_empty_cells()) for area in self.areas.values()) if columns}
-
-        process_line(areas_rows, lambda area: area.get_rows_of_empty_cells())
-        process_line(areas_columns, lambda area: area.get_columns_of_empty_cells())
+        # Apply rule for areas in rows and in columns
+        process_line(axis=1)
+        process_line(axis=0)
 
         return crown, crosses
 
@@ -492,17 +620,12 @@ class Solver:
         crown_found = False
         print("Guessing Crowns...")
 
-        # Step 1: Create a dictionary with area keys and their empty cells
-        area_empty_cells = {key: area.get_empty_cells() for key, area in self.areas.items()}
-
-        # Step 2: Order the dictionary by the number of empty cells (values)
-        sorted_area_empty_cells = dict(sorted(area_empty_cells.items(), key=lambda item: len(item[1])))
-
-        # Step 3: Remove entries where the list of empty cells is empty
-        filtered_area_empty_cells = {key: cells for key, cells in sorted_area_empty_cells.items() if cells}
+        # Steps 1-3: Take the area with the fewest empty cells, skipping areas without empty cells
+        target_area = min((area for area, count in self.area_empty_count.items() if count),
+                          key=self.area_empty_count.get)
 
-        # Step 4: Make a simulated board (save current board to load later)
-        save_state_board = self.board.save_state()
+        # Step 4: Make a simulated board (mark the trail to undo the guess later)
+        mark = self._mark()
         save_crowns = self.crowns
         save_guess_flag = self.guess_flag
         self.guess_flag = True
@@ -512,7 +635,7 @@ class Solver:
         self.click_enabled = False
 
         # Step 6: Pick a cell in the smallest area
-        target_cell = next(iter(filtered_area_empty_cells.values()))[0]
+        target_cell = target_area.get_empty_cells()[0]
         self.crown_cell(target_cell)
 
         # Step 7: Attempt to solve with the guess
@@ -525,7 +648,7 @@ class Solver:
 
         # Final Step: Undo the simulation
         self.click_enabled = save_click_enabled
-        self.board.load_state(save_state_board)
+        self._restore(mark)
         self.crowns = save_crowns
         self.guess_flag = save_guess_flag
 
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from utils.jit import JIT_ENABLED
+from utils.logic import find_matching_entries, _search
+
+
+class TestFindMatchingEntries(unittest.TestCase):
+    def test_matching_entries_found(self):
+        # Two entries share the same two values
+        dictionary = {"a": [1, 2], "b": [3], "c": [1, 2], "d": [2, 3, 4]}
+
+        matching_entries = find_matching_entries(dictionary, 2)
+
+        self.assertEqual(matching_entries, ["a", "c"])
+
+    def test_no_matching_entries(self):
+        # Every pair of entries combines into more than two values
+        dictionary = {"a": [1, 2], "b": [3, 4], "c": [5, 6]}
+
+        matching_entries = find_matching_entries(dictionary, 2)
+
+        self.assertIsNone(matching_entries)
+
+    def test_entries_with_too_many_values_are_ignored(self):
+        # Entry "c" has more values than the threshold
+        dictionary = {"a": [1], "b": [2], "c": [1, 2, 3]}
+
+        matching_entries = find_matching_entries(dictionary, 2)
+
+        self.assertEqual(matching_entries, ["a", "b"])
+
+    def test_not_enough_entries(self):
+        # Test when there are fewer entries than the threshold
+        dictionary = {"a": [1, 2]}
+
+        matching_entries = find_matching_entries(dictionary, 2)
+
+        self.assertIsNone(matching_entries)
+
+
+@unittest.skipUnless(JIT_ENABLED, "Numba is not installed or NUMBA_DISABLE_JIT is set")
+class TestSearchKernel(unittest.TestCase):
+    def test_compiled_search(self):
+        # Compiles the bitmask search to catch compilation regressions
+        masks = np.array([0b011, 0b100, 0b011], dtype=np.uint64)
+        picked = np.empty(2, dtype=np.int64)
+
+        found = _search(masks, 2, 0, 0, np.uint64(0), picked)
+
+        self.assertTrue(found)
+        self.assertEqual(picked.tolist(), [0, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,37 @@
 import os
 import unittest
-from unittest.mock import patch, Mock
+from unittest.mock import patch
 
-from utils.screen import capture_screenshot_of_grid
+import numpy as np
+
+from board.cell import Cell
+from utils.jit import JIT_ENABLED
+from utils.screen import capture_screenshot_of_grid, square_corners, detect_gridlines, color_cells, _scan_runs, \
+    save_png_in_background, count_peaks
+
+
+class FakeScreenShot:
+    """
+    Stand-in for an mss screenshot: BGRA pixels exposed through the array interface.
+    """
+    def __init__(self, width, height):
+        self.pixels = np.zeros((height, width, 4), dtype=np.uint8)
+        self.pixels[..., 0] = 10  # Blue
+        self.pixels[..., 2] = 30  # Red
+        self.pixels[..., 3] = 255  # Alpha
+        self.size = (width, height)
+        self.rgb = b"rgb"
+        self.__array_interface__ = self.pixels.__array_interface__
 
 
 class TestCaptureScreenshotOfGrid(unittest.TestCase):
-    @patch("pyautogui.screenshot")
-    def test_valid_grid_area(self, mock_screenshot):
-        # Mock the screenshot and save methods
-        mock_image = Mock()
-        mock_screenshot.return_value = mock_image
-        mock_image.save = Mock()
+    @patch("mss.tools.to_png")
+    @patch("mss.mss")
+    def test_valid_grid_area(self, mock_mss, mock_to_png):
+        # Mock the screen grab
+        mock_image = FakeScreenShot(200, 200)
+        mock_sct = mock_mss.return_value.__enter__.return_value
+        mock_sct.grab.return_value = mock_image
 
         # Define a valid grid area and save path
         grid_area = (100, 100, 200, 200)
@@ -20,39 +40,34 @@ class TestCaptureScreenshotOfGrid(unittest.TestCase):
         # Call the function
         capture_screenshot_of_grid(grid_area, save_path)
 
-        # Assert screenshot and save were called with correct arguments
-        mock_screenshot.assert_called_once_with(region=(100, 100, 200, 200))
-        mock_image.save.assert_called_once_with(save_path)
+        # Assert grab and save were called with correct arguments
+        mock_sct.grab.assert_called_once_with({"left": 100, "top": 100, "width": 200, "height": 200})
+        mock_to_png.assert_called_once_with(mock_image.rgb, mock_image.size, output=save_path)
 
         # Cleanup test file if created
         if os.path.exists(save_path):
             os.remove(save_path)
 
-    @patch("pyautogui.screenshot")
-    def test_default_save_path(self, mock_screenshot):
-        # Mock the screenshot and save methods
-        mock_image = Mock()
-        mock_screenshot.return_value = mock_image
-        mock_image.save = Mock()
-
-        # Define a valid grid area
-        grid_area = (100, 100, 200, 200)
-
-        # Call the function with default path
-        capture_screenshot_of_grid(grid_area)
+    @patch("mss.tools.to_png")
+    @patch("mss.mss")
+    def test_returns_bgr_array_without_saving(self, mock_mss, mock_to_png):
+        # Mock the screen grab
+        mock_sct = mock_mss.return_value.__enter__.return_value
+        mock_sct.grab.return_value = FakeScreenShot(4, 3)
 
-        # Assert screenshot and save were called with correct arguments
-        mock_screenshot.assert_called_once_with(region=(100, 100, 200, 200))
-        mock_image.save.assert_called_once_with("assets/grid_screenshot.png")
+        # Call the function without a save path
+        screenshot = capture_screenshot_of_grid((100, 100, 4, 3))
 
-        # Cleanup test file if created
-        if os.path.exists("assets/grid_screenshot.png"):
-            os.remove("assets/grid_screenshot.png")
+        # Assert the screenshot is returned in BGR format and not saved
+        self.assertEqual(screenshot.shape, (3, 4, 3))
+        self.assertTrue((screenshot == (10, 0, 30)).all())
+        mock_to_png.assert_not_called()
 
-    @patch("pyautogui.screenshot")
-    def test_invalid_grid_area(self, mock_screenshot):
-        # Mock the screenshot method to raise a ValueError
-        mock_screenshot.side_effect = ValueError("Invalid region dimensions")
+    @patch("mss.mss")
+    def test_invalid_grid_area(self, mock_mss):
+        # Mock the screen grab to raise a ValueError
+        mock_sct = mock_mss.return_value.__enter__.return_value
+        mock_sct.grab.side_effect = ValueError("Invalid region dimensions")
 
         # Define an invalid grid area
         grid_area = (-100, -100, -200, -200)
@@ -63,12 +78,14 @@ class TestCaptureScreenshotOfGrid(unittest.TestCase):
 
         self.assertEqual(str(context.exception), "Invalid region dimensions")
 
-    @patch("pyautogui.screenshot")
-    def test_non_writable_save_path(self, mock_screenshot):
-        # Mock the screenshot and save methods
-        mock_image = Mock()
-        mock_screenshot.return_value = mock_image
-        mock_image.save = Mock(side_effect=PermissionError("Permission denied"))
+    @patch("utils.screen.ensure_directory_exists")
+    @patch("mss.tools.to_png")
+    @patch("mss.mss")
+    def test_non_writable_save_path(self, mock_mss, mock_to_png, mock_ensure_directory_exists):
+        # Mock the screen grab and make saving fail
+        mock_sct = mock_mss.return_value.__enter__.return_value
+        mock_sct.grab.return_value = FakeScreenShot(200, 200)
+        mock_to_png.side_effect = PermissionError("Permission denied")
 
         # Define a valid grid area and a non-writable path
         grid_area = (100, 100, 200, 200)
@@ -81,5 +98,156 @@ class TestCaptureScreenshotOfGrid(unittest.TestCase):
         self.assertEqual(str(context.exception), "Permission denied")
 
 
+class TestSavePngInBackground(unittest.TestCase):
+    @patch("utils.screen.save_png")
+    def test_saves_a_copy(self, mock_save_png):
+        # Test that the saved image is not affected by later changes to the original
+        image = np.zeros((2, 2), dtype=np.uint8)
+
+        save_png_in_background("assets/test_image.png", image).result()
+        image[:] = 255
+
+        save_path, saved_image = mock_save_png.call_args[0]
+        self.assertEqual(save_path, "assets/test_image.png")
+        self.assertTrue((saved_image == 0).all())
+
+
+class TestCountPeaks(unittest.TestCase):
+    def test_groups_above_threshold(self):
+        # Test that consecutive values above the threshold count as a single peak
+        profile = np.array([10, 10, 0, 3, 0, 8, 9, 7, 0, 6])
+
+        self.assertEqual(count_peaks(profile, 5), 3)
+
+    def test_no_peaks(self):
+        # Test a profile without values above the threshold
+        self.assertEqual(count_peaks(np.zeros(5), 0), 0)
+
+
+class TestSquareCorners(unittest.TestCase):
+    def setUp(self):
+        # A 16x20 board with a 2 pixel vertical and 1 pixel horizontal border and rounded corners
+        self.board = np.zeros((16, 20), dtype=np.uint8)
+        self.board[:, :2] = 255
+        self.board[:, -2:] = 255
+        self.board[:1, :] = 255
+        self.board[-1:, :] = 255
+        # Round the corners by clearing the outer pixels next to each corner
+        self.board[0, :3] = self.board[0, -3:] = self.board[-1, :3] = self.board[-1, -3:] = 0
+        self.board[:3, 0] = self.board[-3:, 0] = self.board[:3, -1] = self.board[-3:, -1] = 0
+
+    def test_rounded_corners_are_filled(self):
+        # Test that the borders are filled and the inner corners painted black
+        result = square_corners(self.board)
+
+        self.assertTrue((result[:, :2] == 255).all())
+        self.assertTrue((result[:, -2:] == 255).all())
+        self.assertTrue((result[0, :] == 255).all())
+        self.assertTrue((result[-1, :] == 255).all())
+        for row, col in ((1, 2), (1, -3), (-2, 2), (-2, -3)):
+            self.assertEqual(result[row, col], 0)
+
+    def test_square_corners_unchanged(self):
+        # Test that a board with square corners is returned unchanged
+        self.board[:, :2] = 255
+        self.board[:, -2:] = 255
+        self.board[:1, :] = 255
+        self.board[-1:, :] = 255
+        expected = self.board.copy()
+
+        result = square_corners(self.board)
+
+        np.testing.assert_array_equal(result, expected)
+
+
+class TestDetectGridlines(unittest.TestCase):
+    def setUp(self):
+        # A 9x14 board with a 2 pixel left border, 1 pixel borders elsewhere and two 1 pixel inner lines each way
+        self.board = np.zeros((9, 14), dtype=np.uint8)
+        self.board[:, [0, 1, 5, 9, 13]] = 255
+        self.board[[0, 4, 8], :] = 255
+
+    def test_horizontal_gridlines(self):
+        # Test that the first mixed row gives a gridline in the middle of every group of white pixels
+        horizontal_gridlines, _ = detect_gridlines(self.board)
+
+        self.assertEqual([(line.position, line.thickness) for line in horizontal_gridlines],
+                         [(0, 2), (5, 1), (9, 1), (13, 1)])
+        self.assertTrue(all(line.orientation == 'horizontal' for line in horizontal_gridlines))
+
+    def test_vertical_gridlines(self):
+        # Test that the first mixed column (not row) is scanned for vertical gridlines
+        _, vertical_gridlines = detect_gridlines(self.board)
+
+        self.assertEqual([(line.position, line.thickness) for line in vertical_gridlines],
+                         [(0, 1), (4, 1), (8, 1)])
+        self.assertTrue(all(line.orientation == 'vertical' for line in vertical_gridlines))
+
+
+class TestDetectGridlinesFixedSize(unittest.TestCase):
+    def setUp(self):
+        # A 13x13 board with 3x3 cells and 1 pixel gridlines
+        self.board = np.zeros((13, 13), dtype=np.uint8)
+        self.board[:, [0, 4, 8, 12]] = 255
+        self.board[[0, 4, 8, 12], :] = 255
+
+    def test_known_grid_size(self):
+        # Test that the gridlines are located when the grid size is known
+        horizontal_gridlines, vertical_gridlines = detect_gridlines(self.board, grid_size=3)
+
+        self.assertEqual([(line.position, line.thickness) for line in horizontal_gridlines],
+                         [(0, 1), (4, 1), (8, 1), (12, 1)])
+        self.assertEqual([line.position for line in vertical_gridlines], [0, 4, 8, 12])
+
+    def test_wrong_grid_size_falls_back_to_scan(self):
+        # Test that a grid size that doesn't match the board gives the same gridlines as a full scan
+        expected = [[(line.position, line.thickness) for line in lines] for lines in detect_gridlines(self.board)]
+
+        gridlines = detect_gridlines(self.board, grid_size=2)
+
+        self.assertEqual([[(line.position, line.thickness) for line in lines] for lines in gridlines], expected)
+
+
+@unittest.skipUnless(JIT_ENABLED, "Numba is not installed or NUMBA_DISABLE_JIT is set")
+class TestScanRunsKernel(unittest.TestCase):
+    def test_compiled_scan(self):
+        # Compiles the gridline scan to catch compilation regressions
+        board = np.array([[255, 255, 255, 255, 255],
+                          [255, 0, 255, 255, 0],
+                          [255, 0, 0, 0, 255]], dtype=np.uint8)
+
+        mids, thicknesses = _scan_runs(board, False)
+
+        # The second row ends with a black pixel, so the scan continues with the third one
+        self.assertEqual(mids.tolist(), [0, 2, 0, 4])
+        self.assertEqual(thicknesses.tolist(), [1, 2, 1, 1])
+
+    def test_compiled_column_scan(self):
+        # Test that columns are scanned in place
+        board = np.array([[255, 255, 255],
+                          [255, 0, 0],
+                          [255, 255, 0]], dtype=np.uint8)
+
+        mids, thicknesses = _scan_runs(board, True)
+
+        # The second column (first mixed one) ends with a white pixel
+        self.assertEqual(mids.tolist(), [0, 2])
+        self.assertEqual(thicknesses.tolist(), [1, 1])
+
+
+class TestColorCells(unittest.TestCase):
+    def test_cells_get_rgb_color_of_their_center(self):
+        # Test that each cell gets the color at its center, offset by the board position, converted to RGB
+        image = np.zeros((20, 30, 3), dtype=np.uint8)
+        image[12, 15] = (255, 0, 10)  # BGR
+        image[12, 25] = (0, 128, 0)
+        cells = [Cell(5, 2, 10), Cell(15, 2, 10)]
+
+        color_cells(image, cells, 10, 10)
+
+        self.assertEqual(cells[0].color, (10, 0, 255))
+        self.assertEqual(cells[1].color, (0, 128, 0))
+
+
 if __name__ == '__main__':
     unittest.main()
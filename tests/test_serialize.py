@@ -0,0 +1,73 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from board.board import Board
+from board.cell import Cell
+from board.serialize import save_board_npz, load_board_npz
+
+
+class TestBoardSerialization(unittest.TestCase):
+    def setUp(self):
+        # Set up a simple 2x2 board with colored cells in different states
+        self.cells = [Cell(x * 10 + 5, y * 10 + 5, 10) for y in range(2) for x in range(2)]
+        self.cells[0].set_color((255, 0, 0))
+        self.cells[1].set_color((0, 255, 0))
+        self.cells[2].set_color((0, 0, 255))
+        self.cells[1].set_state("cross")
+        self.cells[2].set_state("crown")
+        self.board = Board((100, 200), self.cells)
+
+        self.file_path = os.path.join(tempfile.mkdtemp(), "board_obj.npz")
+
+    def tearDown(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_round_trip(self):
+        # Test that a saved board is loaded back with the same cells
+        save_board_npz(self.file_path, self.board)
+        loaded_board = load_board_npz(self.file_path)
+
+        self.assertEqual(loaded_board.get_position(), (100, 200))
+        self.assertEqual(loaded_board.get_dimensions(), (2, 2))
+        for row, loaded_row in zip(self.board.cells, loaded_board.cells):
+            for cell, loaded_cell in zip(row, loaded_row):
+                self.assertEqual(loaded_cell.get_coordinates(), cell.get_coordinates())
+                self.assertEqual(loaded_cell.size, cell.size)
+                self.assertEqual(loaded_cell.color, cell.color)
+                self.assertEqual(loaded_cell.state, cell.state)
+
+    def test_cell_without_color(self):
+        # Test that cells without a color are loaded without a color
+        save_board_npz(self.file_path, self.board)
+        loaded_board = load_board_npz(self.file_path)
+
+        self.assertIsNone(loaded_board.get_cell_at(1, 1).color)
+
+
+class TestCellPickle(unittest.TestCase):
+    def test_pickle_round_trip(self):
+        # Test that a pickled cell keeps its state and color
+        cell = Cell(15, 25, 10, state=Cell.CROWN)
+        cell.set_color((0, 0, 255))
+
+        loaded_cell = pickle.loads(pickle.dumps(cell))
+
+        self.assertEqual(loaded_cell.state_id, Cell.CROWN)
+        self.assertEqual(loaded_cell.color, (0, 0, 255))
+        self.assertEqual(loaded_cell.get_coordinates(), (15, 25))
+
+    def test_legacy_pickle_state(self):
+        # Test that cells pickled with a string state are restored with its state id
+        cell = Cell.__new__(Cell)
+        cell.__setstate__({"x": 15, "y": 25, "size": 10, "color": None, "state": "cross",
+                           "row_ref": None, "column_ref": None, "area_ref": None})
+
+        self.assertEqual(cell.state_id, Cell.CROSS)
+        self.assertTrue(cell.is_cross())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,49 +1,47 @@
 import unittest
+from unittest.mock import patch
 
 from board.board import Board
 from board.cell import Cell
-from board.line import Row, Column
 from utils.debug import load_board_state
 from settings.settings import load_settings
 from solver.solver import Solver, get_common_cells
 
 
 class TestSolver(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Set up the test environment with a mock board and cells.
+        Build the mock board and cells once for all the tests of this class.
         """
-        # Create mock cells
-        self.cell1 = Cell(state="empty")
-        self.cell2 = Cell(state="empty")
-        self.cell3 = Cell(state="crossed")
-        self.cell4 = Cell(state="empty")
+        # Disable clicking so crossing cells only changes their states
+        settings_patcher = patch("solver.solver.get_setting", return_value=None)
+        settings_patcher.start()
+        cls.addClassCleanup(settings_patcher.stop)
+
+        # Create mock cells (a 2x2 board, the third cell is already crossed)
+        cls.cell1 = Cell(0, 0, 10, state=Cell.EMPTY)
+        cls.cell2 = Cell(10, 0, 10, state=Cell.EMPTY)
+        cls.cell3 = Cell(0, 10, 10, state=Cell.CROSS)
+        cls.cell4 = Cell(10, 10, 10, state=Cell.EMPTY)
+        cls.board = Board((0, 0), [cls.cell1, cls.cell2, cls.cell3, cls.cell4])
 
-        # Create rows and columns
-        self.row1 = Row(index=1, cells=[self.cell1, self.cell2, self.cell3])
-        self.row2 = Row(index=2, cells=[self.cell4])
-        self.col1 = Column(index=1, cells=[self.cell1, self.cell4])
-        self.col2 = Column(index=2, cells=[self.cell2])
-        self.col3 = Column(index=3, cells=[self.cell3])
+        # Initial cell states, restored before each test
+        cls.initial_states = [(cell, cell.state_id) for cell in (cls.cell1, cls.cell2, cls.cell3, cls.cell4)]
 
-        # Assign rows and columns to cells
-        for cell in self.row1.cells:
-            cell.row_ref = self.row1
-        for cell in self.row2.cells:
-            cell.row_ref = self.row2
-        for cell in self.col1.cells:
-            cell.column_ref = self.col1
-        for cell in self.col2.cells:
-            cell.column_ref = self.col2
-        for cell in self.col3.cells:
-            cell.column_ref = self.col3
+    def setUp(self):
+        """
+        Reset the cell states changed by previous tests and create a new solver.
+        """
+        for cell, state_id in self.initial_states:
+            cell.state_id = state_id
 
-        # Solver instance
-        self.solver = Solver()
+        # Solver instance (creates the rows and columns of the board)
+        self.solver = Solver(self.board)
 
-    def test_set_all_cells_crossed(self):
+    def test_cross_cells_path(self):
         """
-        Test the `set_all_cells_crossed` method with valid input.
+        Test the `cross_cells_path` method with valid input.
         """
         cells = [self.cell1, self.cell2, self.cell3, self.cell4]
 
@@ -51,11 +49,11 @@ class TestSolver(unittest.TestCase):
         try:
             self.solver.cross_cells_path(cells)
         except Exception as e:
-            self.fail(f"set_all_cells_crossed raised an unexpected exception: {e}")
+            self.fail(f"cross_cells_path raised an unexpected exception: {e}")
 
     def test_invalid_cells(self):
         """
-        Test that `set_all_cells_crossed` raises a TypeError for invalid input.
+        Test that `cross_cells_path` raises a TypeError for invalid input.
         """
         invalid_cells = [self.cell1, "not a cell", 123]
 
@@ -67,11 +65,15 @@ class TestSolver(unittest.TestCase):
         Test that only empty cells are considered.
         """
         cells = [self.cell1, self.cell2, self.cell3, self.cell4]
+
+        # Every test starts from the same board, even after other tests crossed its cells
+        filtered_cells = [cell for cell in cells if cell.state_id == Cell.EMPTY]
+        self.assertEqual(filtered_cells, [self.cell1, self.cell2, self.cell4])
+
         self.solver.cross_cells_path(cells)
 
-        # Verify that crossed cells are ignored (mock functionality for now)
-        filtered_cells = [cell for cell in cells if cell.is_empty()]
-        self.assertEqual(len(filtered_cells), 3)
+        # Verify that the empty cells are crossed and the crossed cell isn't toggled again
+        self.assertEqual([cell.state_id for cell in cells], [Cell.CROSS] * 4)
 
 
 class TestGetCommonCells(unittest.TestCase):
@@ -120,6 +122,17 @@ class TestGetCommonCells(unittest.TestCase):
 
         self.assertEqual(common_cells, [])
 
+    def test_empty_set(self):
+        # Test where one of the sets is empty
+        cell1 = self.Cell(1)
+        cell2 = self.Cell(2)
+
+        sets_of_cells = [{cell1, cell2}, set(), {cell1}]
+
+        common_cells = get_common_cells(sets_of_cells)
+
+        self.assertEqual(common_cells, [])
+
     def test_empty_input(self):
         # Test for empty input (empty list of sets)
         sets_of_cells = []
@@ -158,13 +171,19 @@ class TestGetCommonCells(unittest.TestCase):
 
 
 class TestSolverRules(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Load the board state once for all the tests of this class.
+        """
+        load_settings("../settings/settings.json")
+        cls.board: Board = load_board_state()
+
     def setUp(self):
         """
-        Set up the test environment by loading the board state.
+        Check that the board state was loaded.
         This method is executed before each test.
         """
-        load_settings("../settings/settings.json")
-        self.board: Board = load_board_state()
         if not self.board:
             self.fail("Failed to load board state for testing.")
 
@@ -1,9 +1,24 @@
-import tkinter as tk
+from tkinter import ttk
+
+# Shared button style, configured once when the first button is created
+_style = None
+
+
+def _get_style():
+    """
+    Create and configure the shared button style on first use (a Tk root window must exist).
+    """
+    global _style
+    if _style is None:
+        _style = ttk.Style()
+        _style.configure("Crown.TButton", padding=(10, 5))
+    return _style
 
 
 def create_button(parent, text, command):
     """
     Create a button with the given text and command, and attach it to the parent widget.
     """
-    button = tk.Button(parent, text=text, command=command, padx=10, pady=5)
+    _get_style()
+    button = ttk.Button(parent, text=text, command=command, style="Crown.TButton")
     return button
@@ -1,7 +1,12 @@
+import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
 from app import process_game_board
 from settings.settings import load_settings
 from ui_components import create_button
+from utils.jit import JIT_ENABLED
+from utils.warmup import warmup_jit
 
 
 class UIManager:
@@ -10,13 +15,23 @@ class UIManager:
         Initialize the UIManager and set up the main window.
         """
         self.status_label = None
+        self.solve_button = None
+        self.exit_button = None
+        self._executor = ThreadPoolExecutor(max_workers=1)  # Runs the solving process off the UI thread
+        self._future = None  # The running solving process, if any
+        self._closing = False  # Set once the application is exiting
         self.root = tk.Tk()
         self.root.title("Crown Solver")
         self.root.geometry("300x200")
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_application)
 
         # Load settings at startup
         load_settings()
 
+        # Compile the solver's JIT kernels in the background while the window is shown
+        if JIT_ENABLED:
+            threading.Thread(target=warmup_jit, daemon=True).start()
+
         # Add components to the UI
         self.setup_ui()
 
@@ -29,12 +44,12 @@ class UIManager:
         title_label.pack(pady=20)
 
         # Solve button
-        solve_button = create_button(self.root, "Start Process", self.start_process)
-        solve_button.pack(pady=10)
+        self.solve_button = create_button(self.root, "Start Process", self.start_process)
+        self.solve_button.pack(pady=10)
 
         # Exit button
-        exit_button = create_button(self.root, "Exit", self.exit_application)
-        exit_button.pack(pady=10)
+        self.exit_button = create_button(self.root, "Exit", self.exit_application)
+        self.exit_button.pack(pady=10)
 
         # Status label
         self.status_label = tk.Label(self.root, text="", fg="green", font=("Helvetica", 10))
@@ -42,9 +57,42 @@ class UIManager:
 
     def start_process(self):
         """
-        Trigger the solving process and update the status label.
+        Trigger the solving process in a worker thread, keeping the UI responsive.
+        """
+        # Prevent starting a second process, or exiting, while one is running (Esc stops the process)
+        self.solve_button.config(state=tk.DISABLED)
+        self.exit_button.config(state=tk.DISABLED)
+        self.status_label.config(text="Process running... (Esc to stop)", fg="black")
+
+        self._future = self._executor.submit(process_game_board)
+        self._future.add_done_callback(self._schedule_done)
+
+    def _schedule_done(self, future):
+        """
+        Hand the finished solving process back to the Tk main thread, unless the application is exiting.
+
+        Args:
+            future (Future): The finished solving process.
         """
-        success = process_game_board()
+        if self._closing:
+            return
+        self.root.after(0, self._on_done, future)
+
+    def _on_done(self, future):
+        """
+        Update the status label once the solving process has finished.
+
+        Args:
+            future (Future): The finished solving process.
+        """
+        self.solve_button.config(state=tk.NORMAL)
+        self.exit_button.config(state=tk.NORMAL)
+        try:
+            success = future.result()
+        except Exception as e:
+            print(f"Error: {e}")
+            success = False
+
         if success:
             self.status_label.config(text="Process completed successfully!", fg="green")
         else:
@@ -52,8 +100,15 @@ class UIManager:
 
     def exit_application(self):
         """
-        Exit the application.
+        Exit the application. A running solving process can't be interrupted from the UI, so exiting
+        waits until it has finished or has been stopped with Esc.
         """
+        if self._future is not None and not self._future.done():
+            self.status_label.config(text="Press Esc to stop the process before exiting.", fg="red")
+            return
+
+        self._closing = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
         self.root.quit()
 
     def run(self):
@@ -1,12 +1,14 @@
 import pickle
+from pathlib import Path
 
+from board.serialize import load_board_npz
 from settings.settings import get_setting
 from utils.file import resolve_path
 
 
 def load_board_state():
     """
-    Loads a board state from a file.
+    Loads a board state from a file. `.npz` files are loaded as arrays, other files as legacy pickles.
 
     Args:
         filename (str): The name of the file to load the board state from.
@@ -17,10 +19,14 @@ def load_board_state():
     filename = get_setting("paths.board_obj")
     file_path = resolve_path(filename)
     try:
-        with open(file_path, "rb") as file:
-            board_state = pickle.load(file)
-            print(f"Board state loaded from {file_path}")
-            return board_state
+        if Path(file_path).suffix == ".npz":
+            board_state = load_board_npz(file_path)
+        else:
+            # Large buffer so pickle reads the file in a few system calls
+            with open(file_path, "rb", buffering=1 << 20) as file:
+                board_state = pickle.load(file)
+        print(f"Board state loaded from {file_path}")
+        return board_state
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
     except Exception as e:
@@ -1,15 +1,50 @@
 import json
 import os
 import pickle
+from functools import lru_cache
 from pathlib import Path
 import cv2
 import numpy as np
 from PIL import Image
 
+try:
+    import orjson  # Optional: faster JSON parsing
+except ImportError:
+    orjson = None
+
 # Base directory for resolving paths
 BASE_DIR = Path(__file__).resolve().parent.parent
 # Executable directory
 STARTING_PATH: Path | None = None
+# Resolved directory of STARTING_PATH, computed on first use
+_BASE_RESOLVED: Path | None = None
+
+
+def set_starting_path(path):
+    """
+    Set the executable path (STARTING_PATH) and invalidate its cached resolved directory.
+
+    Args:
+        path (str or Path): The path of the executable file or directory.
+    """
+    global STARTING_PATH, _BASE_RESOLVED
+    STARTING_PATH = Path(path)
+    _BASE_RESOLVED = None
+
+
+def _get_base():
+    """
+    Return the resolved executable directory, resolving STARTING_PATH only once.
+
+    Returns:
+        Path: STARTING_PATH's parent directory if it is a file, STARTING_PATH otherwise.
+    """
+    global _BASE_RESOLVED
+    if _BASE_RESOLVED is None:
+        base_path = STARTING_PATH.resolve()
+        # If STARTING_PATH is a file, use its parent directory
+        _BASE_RESOLVED = base_path.parent if base_path.is_file() else base_path
+    return _BASE_RESOLVED
 
 
 def make_relative(absolute_path):
@@ -28,37 +63,55 @@ def make_relative(absolute_path):
     if STARTING_PATH is None:
         raise ValueError("STARTING_PATH is not set. Please set it before calling this function.")
 
-    absolute_path = Path(absolute_path).resolve()
-    base_path = STARTING_PATH.resolve()
-
-    # If STARTING_PATH is a file, use its parent directory
-    if base_path.is_file():
-        base_path = base_path.parent
+    absolute_path = Path(absolute_path)
+    if not absolute_path.is_absolute():
+        absolute_path = absolute_path.resolve()
 
-    try:
-        # Attempt to calculate the relative path
-        relative_path = absolute_path.relative_to(base_path)
-    except ValueError:
-        # If paths don't share a common base, calculate manually using os.relpath
-        relative_path = Path(os.path.relpath(absolute_path, base_path))
-
-    return relative_path
+    return Path(os.path.relpath(absolute_path, _get_base()))
 
 
+@lru_cache(maxsize=256)
 def resolve_path(relative_path):
     """
     Resolve a path relative to the base directory.
+    Results are cached since the same settings paths are resolved repeatedly.
     """
     return BASE_DIR / relative_path
 
 
+@lru_cache(maxsize=8)
+def _read_bytes_cached(file_path, mtime_ns, size):
+    """
+    Read the raw contents of a file, cached by path, modification time and size.
+
+    Args:
+        file_path (str): Path of the file to read.
+        mtime_ns (int): Modification time of the file in nanoseconds, so edited files are read again.
+        size (int): Size of the file in bytes, to catch edits within the filesystem's time resolution.
+
+    Returns:
+        bytes: The contents of the file.
+    """
+    with open(file_path, "rb") as file:
+        return file.read()
+
+
+def _read_bytes(file_path):
+    """
+    Read the raw contents of a file, reusing the cached contents if the file has not changed.
+    """
+    stat = os.stat(file_path)
+    return _read_bytes_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+
+
 def load_json(file_path):
     """
     Load a JSON file and return its contents as a dictionary.
+    The file is only read again from disk when it has been modified.
     """
     try:
-        with open(file_path, "r") as file:
-            return json.load(file)
+        data = _read_bytes(file_path)
+        return orjson.loads(data) if orjson else json.loads(data)
     except FileNotFoundError:
         print(f"File not found: {file_path}")
         return None
@@ -77,6 +130,8 @@ def save_json(file_path, data):
         # Save the JSON file
         with open(file_path, "w") as file:
             json.dump(data, file, indent=4)
+        # Drop cached contents so the next load reads the saved file
+        _read_bytes_cached.cache_clear()
     except Exception as e:
         print(f"Error saving JSON to {file_path}: {e}")
 
@@ -119,21 +174,23 @@ def ensure_directory_exists(directory_path):
 
 def save_png(save_path, image):
     """
-    Save the image as a PNG file. If the input is a numpy array, it will be converted.
+    Save the image as a PNG file. Numpy arrays are encoded directly by OpenCV.
 
     Args:
         save_path (str): Path where the PNG file should be saved.
-        image: Image data (either numpy.ndarray or PIL.Image).
+        image: Image data (either numpy.ndarray in BGR or grayscale format, or PIL.Image).
     """
     # Ensure the directory exists
     ensure_directory_exists(Path(save_path).parent)
 
-    # If the image is a numpy ndarray (OpenCV format)
+    # If the image is a numpy ndarray (OpenCV format), OpenCV encodes it as is.
+    # The bytes are written from Python, since cv2.imwrite can't open non-ASCII paths on Windows.
     if isinstance(image, np.ndarray):
-        # Convert it to RGB (if it's not already in RGB format)
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        # Convert numpy array to PIL Image
-        image = Image.fromarray(image_rgb)
+        ok, buffer = cv2.imencode(".png", image)
+        if not ok:
+            raise OSError(f"Could not encode image for: {save_path}")
+        Path(save_path).write_bytes(buffer.tobytes())
+        return
 
     # If the image is already a PIL Image, no conversion is needed
     if isinstance(image, Image.Image):
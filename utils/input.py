@@ -1,5 +1,6 @@
 from typing import Optional, Dict, Tuple
 
+import numpy as np
 import pyautogui
 import pynput.mouse as mouse
 from pynput import keyboard
@@ -108,26 +109,20 @@ def click_and_drag(start_coords, end_coords, duration=0.5):
 
 def click_on_all_cells(board_obj, duration=0.02):
     """
-    Clicks on every cell of the game board by calculating the center of each cell
-    and using the click_at function.
+    Clicks on every cell of the game board by calculating the center of each cell.
 
     Args:
         board_obj (Board): The Board object containing the cells.
-        duration (float): Duration of the mouse movement for each click.
+        duration (float): Duration of the mouse movement for each click (0 to click without moving first).
     """
-    rows, cols = board_obj.get_dimensions()
-
-    # Iterate over every row and column
-    for row in range(rows):
-        for col in range(cols):
-            # Get the cell at (row, col)
-            cell = board_obj.get_cell_at(row, col)
-
-            # Calculate the center of the cell
-            cell_x = cell.x + board_obj.top_left[0]
-            cell_y = cell.y + board_obj.top_left[1]
-
-            # Click at the center of the cell
-            click_at((cell_x, cell_y), duration)
+    # Calculate the screen center of every cell at once
+    offsets = np.array([(cell.x, cell.y) for row in board_obj.cells for cell in row])
+    coordinates = offsets + np.array(board_obj.top_left)
+
+    for cell_x, cell_y in coordinates.tolist():
+        # Skip pyautogui's pause after each action (the click already moves the mouse)
+        if duration > 0:
+            pyautogui.moveTo(cell_x, cell_y, duration=duration, _pause=False)
+        pyautogui.click(cell_x, cell_y, _pause=False)
 
     print("Clicked on all cells.")
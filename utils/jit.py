@@ -0,0 +1,20 @@
+import os
+
+try:
+    from numba import njit
+
+    # Like Numba, NUMBA_DISABLE_JIT=1 turns compilation off (e.g. for coverage runs)
+    JIT_ENABLED = os.environ.get("NUMBA_DISABLE_JIT", "0") in ("", "0")
+except ImportError:
+    JIT_ENABLED = False
+
+if not JIT_ENABLED:
+    def njit(*args, **kwargs):
+        """
+        Fallback for `numba.njit` when Numba is not installed or disabled: returns the function unchanged.
+
+        Supports both the bare `@njit` and the parameterized `@njit(cache=True)` forms.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda function: function
@@ -1,10 +1,77 @@
-from itertools import combinations
-
 from typing import Dict, List, TypeVar, Any
 
+import numpy as np
+
+from utils.jit import njit, JIT_ENABLED
+
 # Create a type variable that will represent the key type in the dictionary
 K = TypeVar('K')
 
+# Maximum number of distinct values that fit in a uint64 mask
+MAX_MASK_VALUES = 64
+
+
+def value_masks(value_lists):
+    """
+    Encodes each list of values as a bitmask, assigning one bit to every distinct value.
+
+    Args:
+        value_lists (iterable): Lists of hashable values.
+
+    Returns:
+        tuple: The list of bitmasks (int) and the number of distinct values.
+    """
+    value_bits = {}
+    masks = []
+    for value_list in value_lists:
+        mask = 0
+        for value in value_list:
+            mask |= 1 << value_bits.setdefault(value, len(value_bits))
+        masks.append(mask)
+    return masks, len(value_bits)
+
+
+@njit(cache=True)
+def _popcount(mask):
+    """
+    Counts the bits set in a uint64 mask (Kernighan's method).
+    """
+    count = 0
+    while mask:
+        mask &= mask - np.uint64(1)
+        count += 1
+    return count
+
+
+@njit(cache=True)
+def _search(masks, threshold, start, depth, acc, picked):
+    """
+    Depth-first search for `threshold` masks whose union has exactly `threshold` bits set.
+
+    Args:
+        masks (numpy.ndarray): The uint64 masks to choose from.
+        threshold (int): The number of masks to pick and the target number of bits.
+        start (int): The first index that can be picked at this depth.
+        depth (int): The number of masks picked so far.
+        acc (numpy.uint64): The union of the masks picked so far.
+        picked (numpy.ndarray): Output buffer (int64, size `threshold`) for the picked indices.
+
+    Returns:
+        bool: True if a combination was found (its indices are stored in `picked`).
+    """
+    for i in range(start, len(masks) - (threshold - depth) + 1):
+        new_acc = acc | masks[i]
+        bits = _popcount(new_acc)
+        if bits > threshold:
+            continue
+        picked[depth] = i
+        if depth + 1 == threshold:
+            if bits == threshold:
+                return True
+        elif _search(masks, threshold, i + 1, depth + 1, new_acc, picked):
+            return True
+    return False
+
 
 def find_matching_entries(dictionary: Dict[K, List[Any]], threshold: int) -> List[K]:
     """
@@ -18,19 +85,45 @@ def find_matching_entries(dictionary: Dict[K, List[Any]], threshold: int) -> Lis
         list: A list of X entries from D whose combined values form a set with exactly X elements.
         None: If no such combination exists.
     """
-    # Filter out dictionary entries where the list length is greater than X
-    filtered_dict = {k: v for k, v in dictionary.items() if len(v) <= threshold}
+    if threshold == 0:
+        return []  # No entries combine into an empty set
+
+    # Filter out dictionary entries where the list length is greater than X, shortest lists first to prune sooner
+    filtered_items = sorted(((k, v) for k, v in dictionary.items() if len(v) <= threshold),
+                            key=lambda item: len(item[1]))
+    keys = [key for key, _ in filtered_items]
+
+    # Encode each value list as a bitmask so combining entries is a single OR instead of a set union
+    masks, value_count = value_masks(value_list for _, value_list in filtered_items)
+
+    # Use the compiled bitmask search when the values fit in a uint64 mask
+    if JIT_ENABLED and 0 < threshold <= len(filtered_items) and value_count <= MAX_MASK_VALUES:
+        picked = np.empty(threshold, dtype=np.int64)
+        if _search(np.array(masks, dtype=np.uint64), threshold, 0, 0, np.uint64(0), picked):
+            return [keys[index] for index in picked]
+        return None
 
-    # Generate all combinations of X entries from the filtered dictionary
-    for selected_entries in combinations(filtered_dict.items(), threshold):
-        # Combine all lists of the selected entries
-        combined_values = set()
-        for _, value_list in selected_entries:
-            combined_values.update(value_list)
+    def dfs(start, depth, union, picked):
+        # Extend the combination with each remaining entry, leaving enough entries to reach X
+        for i in range(start, len(masks) - (threshold - depth) + 1):
+            new_union = union | masks[i]
+            bits = new_union.bit_count()
+            # Prune: adding more entries can only grow the combined set
+            if bits > threshold:
+                continue
+            if depth + 1 == threshold:
+                if bits == threshold:
+                    return picked + [i]
+            else:
+                result = dfs(i + 1, depth + 1, new_union, picked + [i])
+                if result:
+                    return result
+        return None
 
-        # If the size of the combined set is equal to X, return the combination
-        if len(combined_values) == threshold:
-            return [entry[0] for entry in selected_entries]
+    # Search combinations of X entries whose combined values form a set of size X
+    picked_indices = dfs(0, 0, 0, [])
+    if picked_indices:
+        return [keys[index] for index in picked_indices]
 
     # If no valid combination is found
     return None
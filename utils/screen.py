@@ -1,67 +1,145 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 import cv2
+import mss
+import mss.tools
 import numpy as np
-import pyautogui
 
 from board.board import Board
 from board.cell import Cell
 from board.gridline import Gridline
 from settings.settings import get_setting
-from utils.file import resolve_path, save_png, read_image
+from utils.file import resolve_path, save_png, read_image, ensure_directory_exists
+from utils.jit import njit, JIT_ENABLED
 
+# Default smallest width and height (in pixels) of a component considered as the game board
+MIN_BOARD_SIZE = 100
 
-def capture_screenshot_of_grid(grid_area, save_path):
+# Number of lines of pixels checked at once when looking for the first mixed lines of the board
+SCAN_BLOCK_LINES = 16
+
+# Background writer for the intermediate images, so PNG encoding doesn't hold up the detection
+_io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save_png")
+
+
+@lru_cache(maxsize=None)
+def _setting_path(key):
     """
-    Capture a screenshot of the selected grid area and save it to a file.
+    Resolves the path stored in a setting. Cached, since the path settings don't change while the app runs.
+
+    Args:
+        key (str): The setting key (e.g. "paths.screenshot_binary_img").
+
+    Returns:
+        Path: The resolved path.
+    """
+    return resolve_path(get_setting(key))
+
+
+def _report_save_error(future):
+    """
+    Prints the error of a failed background image save.
+    """
+    if future.exception() is not None:
+        print(f"Error saving intermediate image: {future.exception()}")
+
+
+def save_png_in_background(save_path, image):
+    """
+    Saves a copy of the image as a PNG file in a background thread.
+
+    Args:
+        save_path (str): Path where the PNG file should be saved.
+        image (numpy array): The image to save. It is copied, so it can be modified while it is being saved.
+
+    Returns:
+        Future: The pending save.
+    """
+    future = _io_pool.submit(save_png, save_path, image.copy())
+    future.add_done_callback(_report_save_error)
+    return future
+
+
+def capture_screenshot_of_grid(grid_area, save_path=None):
+    """
+    Capture a screenshot of the selected grid area, optionally saving it to a file.
+    Only the selected region is grabbed from the screen (using mss) and returned as a NumPy array,
+    so it can be passed to `detect_game_board` without reading it back from disk.
 
     Args:
         grid_area (tuple): (x, y, width, height) of the grid area.
-        save_path (str): Path to save the screenshot.
+        save_path (str, optional): Path to save the screenshot as a PNG file.
 
     Returns:
-        None
+        numpy array: The screenshot in BGR format.
     """
     x, y, width, height = grid_area
-    screenshot = pyautogui.screenshot(region=(x, y, width, height))
-    save_png(save_path, screenshot)
+    # mss instances are bound to the thread that creates them, so use one per capture
+    with mss.mss() as sct:
+        screenshot = sct.grab({"left": x, "top": y, "width": width, "height": height})
+
+    if save_path is not None:
+        ensure_directory_exists(Path(save_path).parent)
+        mss.tools.to_png(screenshot.rgb, screenshot.size, output=save_path)
 
+    # mss grabs BGRA pixels, drop the alpha channel
+    return cv2.cvtColor(np.asarray(screenshot), cv2.COLOR_BGRA2BGR)
 
-def load_and_preprocess_image(image_path: Path, save_intermediate=False):
+
+def load_and_preprocess_image(image, save_intermediate=False):
     """
-    Loads an image from the specified path, converts it to grayscale,
+    Loads an image from the specified path (unless it is already loaded), converts it to grayscale,
     and thresholds it to create a binary image.
 
     Args:
-        image_path (str): Path to the image file.
+        image (str, Path or numpy array): Path to the image file, or the image itself in BGR format.
         save_intermediate (bool): Whether to save the grayscale and binary images.
 
     Returns:
         tuple: Original image (numpy array) and binary image (numpy array).
     """
-    img = read_image(image_path)
+    img = image if isinstance(image, np.ndarray) else read_image(image)
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
-    # Use resolve_path to get proper paths for saving intermediate images
-    binary_path = resolve_path(get_setting("paths.screenshot_binary_img"))
-    grayscale_path = resolve_path(get_setting("paths.screenshot_grayscale_img"))
-
     if save_intermediate:
-        # Save grayscale image using save_png from file.py
-        save_png(grayscale_path, gray)
+        # Save grayscale image in the background
+        save_png_in_background(_setting_path("paths.screenshot_grayscale_img"), gray)
+        binary = np.empty_like(gray)
+    else:
+        # The grayscale image is not needed afterwards, so threshold it in place
+        binary = gray
 
-    _, binary = cv2.threshold(gray, 50, 255, cv2.THRESH_BINARY_INV)
+    cv2.threshold(gray, 50, 255, cv2.THRESH_BINARY_INV, dst=binary)
 
     if save_intermediate:
-        # Save binary image using save_png from file.py
-        save_png(binary_path, binary)
+        # Save binary image in the background (the board is later squared in place)
+        save_png_in_background(_setting_path("paths.screenshot_binary_img"), binary)
 
     return img, binary
 
 
+def count_peaks(profile, threshold):
+    """
+    Counts the peaks of a projection profile, as the groups of consecutive values above a threshold.
+    Straight lines in an edge image show up as peaks in its column (vertical lines) or row (horizontal lines) sums.
+
+    Args:
+        profile (numpy array): The sums of the edge image along one axis.
+        threshold (float): The value a peak must exceed.
+
+    Returns:
+        int: The number of peaks.
+    """
+    above = profile > threshold
+    # Count the starts of the groups of values above the threshold
+    return int(above[0]) + int(np.count_nonzero(above[1:] & ~above[:-1]))
+
+
 def find_game_board(binary_image, save_intermediate=False):
     """
-    Identifies the largest rectangular contour in the binary image,
+    Identifies the largest square connected component in the binary image with gridlines,
     assumed to be the game board, and extracts its bounding rectangle.
 
     Args:
@@ -79,78 +157,82 @@ def find_game_board(binary_image, save_intermediate=False):
     Raises:
         ValueError: If no suitable game board is found in the binary image.
     """
-    binary_board_path = get_setting("paths.board_binary_img")
-
-    contours, hierarchy = cv2.findContours(binary_image, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-    for contour in contours:
-        x, y, w, h = cv2.boundingRect(contour)
-        aspect_ratio = w / h
-
-        # Validate square aspect ratio
-        if not (0.9 <= aspect_ratio <= 1.1):
-            continue
-
-        # Check for nested smaller squares
-        nested_contours = sum(1 for i in hierarchy[0] if i[3] != -1)
-        if nested_contours < 5:  # Expect at least 5 inner squares
-            continue
+    # Bounding boxes of the white (gridline) components, skipping the background label 0
+    _, _, stats, _ = cv2.connectedComponentsWithStats(binary_image, connectivity=8)
+    stats = stats[1:]
+    widths = stats[:, cv2.CC_STAT_WIDTH]
+    heights = stats[:, cv2.CC_STAT_HEIGHT]
+    box_areas = widths * heights
+    aspect_ratios = widths / heights
+
+    # Validate square aspect ratio and a minimum size before any cropping, then try the largest candidates first
+    min_size = get_setting("board_detection.min_board_size", MIN_BOARD_SIZE)
+    candidates = np.flatnonzero((0.9 <= aspect_ratios) & (aspect_ratios <= 1.1) &
+                                (widths >= min_size) & (heights >= min_size))
+    for index in candidates[np.argsort(-box_areas[candidates], kind="stable")]:
+        x, y, w, h = (int(value) for value in stats[index, :cv2.CC_STAT_AREA])
 
         # Validate gridlines
         board = binary_image[y:y + h, x:x + w]
         edges = cv2.Canny(board, 50, 150, apertureSize=3)
-        lines = cv2.HoughLines(edges, 1, np.pi / 180, threshold=100)
-        if lines is None or len(lines) < 5:  # Require at least 5 lines
+        # Require at least 5 lines spanning half of the board in each direction
+        vertical_lines = count_peaks(edges.sum(axis=0), h * 255 / 2)
+        horizontal_lines = count_peaks(edges.sum(axis=1), w * 255 / 2)
+        if vertical_lines < 5 or horizontal_lines < 5:
             continue
 
         # Save intermediate result
         if save_intermediate:
-            cv2.imwrite(binary_board_path, board)
+            save_png_in_background(_setting_path("paths.board_binary_img"), board)
 
-        return x, y, w, h, board
+        # Copy the board out of the screenshot into a C-contiguous buffer: it is squared in place and then
+        # scanned line by line, which is faster on contiguous rows
+        return x, y, w, h, np.ascontiguousarray(board)
 
     raise ValueError("Game board not found!")
 
 
+def white_run_length(pixels):
+    """
+    Counts the consecutive white pixels at the start of a line of pixels.
+
+    Args:
+        pixels (numpy array): A 1D slice of the binary image.
+
+    Returns:
+        int: The number of white (255) pixels before the first non-white one.
+    """
+    not_white = pixels != 255
+    return int(np.argmax(not_white)) if not_white.any() else len(pixels)
+
+
 def square_corners(cropped_binary):
     height, width = cropped_binary.shape
 
     # Check if any of the corners are rounded (if any corner has a value of 0)
-    if cropped_binary[0, 0] == 0 or cropped_binary[0, width - 1] == 0 or cropped_binary[height - 1, 0] == 0 or \
-            cropped_binary[height - 1, width - 1] == 0:
+    corners = (cropped_binary[0, 0], cropped_binary[0, -1], cropped_binary[-1, 0], cropped_binary[-1, -1])
+    if 0 in corners:
 
         # VERTICAL LEFT AND RIGHT
-        v_thickness = 0
-
-        # Find the first row where a black pixel is on the wall (left side)
-        for row in range(height):
-            if cropped_binary[row, 0] == 255:
-                # Count the thickness of the leftmost vertical line
-                while v_thickness < width and cropped_binary[row, v_thickness] == 255:
-                    v_thickness += 1
-                break
+        # Find the first row where a white pixel is on the wall (left side) and count the thickness of the
+        # leftmost vertical line
+        left_wall = cropped_binary[:, 0] == 255
+        v_thickness = white_run_length(cropped_binary[np.argmax(left_wall), :]) if left_wall.any() else 0
 
         # HORIZONTAL UP AND DOWN
-        h_thickness = 0
-        # Find the first column where a black pixel is on the wall (top side)
-        for col in range(width):
-            if cropped_binary[0, col] == 255:
-                # Count the thickness of the topmost horizontal line
-                while h_thickness < height and cropped_binary[h_thickness, col] == 255:
-                    h_thickness += 1
-                break
+        # Find the first column where a white pixel is on the wall (top side) and count the thickness of the
+        # topmost horizontal line
+        top_wall = cropped_binary[0, :] == 255
+        h_thickness = white_run_length(cropped_binary[:, np.argmax(top_wall)]) if top_wall.any() else 0
 
         # Left side
-        for row in range(height):
-            cropped_binary[row, :v_thickness] = 255
+        cropped_binary[:, :v_thickness] = 255
         # Right side
-        for row in range(height):
-            cropped_binary[row, width - v_thickness:] = 255
+        cropped_binary[:, width - v_thickness:] = 255
         # Top side
-        for c in range(width):
-            cropped_binary[:h_thickness, c] = 255
+        cropped_binary[:h_thickness, :] = 255
         # Bottom side
-        for col in range(width):
-            cropped_binary[height - h_thickness:, col] = 255
+        cropped_binary[height - h_thickness:, :] = 255
 
         # Paint inner corners black
         cropped_binary[h_thickness, v_thickness] = 0
@@ -168,67 +250,202 @@ def normalize_grid(cropped_binary):
     return square_cropped_binary
 
 
-def detect_gridlines(board):
+def find_white_runs(pixels):
+    """
+    Finds the groups of consecutive white pixels in a line of pixels.
+
+    Args:
+        pixels (numpy array): A 1D slice of the binary image.
+
+    Returns:
+        tuple: Two arrays with the start (inclusive) and end (exclusive) index of each group.
+    """
+    # Positions where the pixels switch between white and not white, including the line ends
+    transitions = np.flatnonzero(np.diff(pixels == 255, prepend=False, append=False))
+    return transitions[::2], transitions[1::2]
+
+
+@njit(cache=True, nogil=True)
+def _scan_runs(board, by_column):
+    """
+    Compiled scan of `scan_gridlines`: finds the groups of white pixels in the first mixed line of pixels,
+    continuing with the next mixed lines until one ends with a white group.
+
+    Args:
+        board (numpy.ndarray): The C-contiguous uint8 binary board.
+        by_column (bool): Whether to scan the columns (vertical gridlines) instead of the rows (horizontal gridlines).
+            Columns are read in place, so only the scanned columns are touched.
+
+    Returns:
+        tuple: Two int32 arrays with the middle position and the thickness of each group.
+
+    Runs without holding the GIL, so the UI thread isn't blocked while the board is detected in a worker thread.
+    """
+    if by_column:
+        length, line_count = board.shape
+    else:
+        line_count, length = board.shape
+    # A line holds at most this many groups of white pixels
+    line_capacity = (length + 1) // 2
+    mids = np.empty(line_capacity, dtype=np.int32)
+    thicknesses = np.empty(line_capacity, dtype=np.int32)
+    count = 0
+
+    for index in range(line_count):
+        # Make room for the groups of this line
+        if len(mids) - count < line_capacity:
+            mids = np.concatenate((mids, np.empty(line_capacity, dtype=np.int32)))
+            thicknesses = np.concatenate((thicknesses, np.empty(line_capacity, dtype=np.int32)))
+
+        # Record the groups while checking that the line mixes white and black pixels, in a single pass
+        line_start = count
+        has_black = False
+        start = -1
+        for position in range(length):
+            pixel = board[position, index] if by_column else board[index, position]
+            if pixel == 255:
+                if start < 0:
+                    start = position
+                continue
+            if pixel == 0:
+                has_black = True
+            if start >= 0:
+                mids[count] = (start + position - 1) // 2
+                thicknesses[count] = position - start
+                count += 1
+                start = -1
+
+        if not has_black or (count == line_start and start < 0):
+            # Not mixed (all white, or no white pixels): drop its groups
+            count = line_start
+            continue
+
+        if start >= 0:  # The last group of white pixels reaches the end of the line
+            mids[count] = (start + length - 1) // 2
+            thicknesses[count] = length - start
+            count += 1
+            break
+
+    return mids[:count], thicknesses[:count]
+
+
+def scan_gridlines(board, orientation):
+    """
+    Detects gridlines by scanning the first line of pixels (rows for horizontal gridlines, columns for vertical
+    gridlines) that mixes white and black pixels, continuing with the next mixed lines until one ends with
+    a white group.
+
+    Args:
+        board (numpy array): The C-contiguous uint8 binary board image.
+        orientation (str): The orientation of the detected gridlines ("horizontal" or "vertical").
+
+    Returns:
+        list: Gridline objects in the middle of each group of white pixels.
+    """
+    by_column = orientation == 'vertical'
+
+    # Use the compiled scan when Numba is available
+    if JIT_ENABLED:
+        mids, thicknesses = _scan_runs(board, by_column)
+        return [Gridline(mid_position, thickness, orientation)
+                for mid_position, thickness in zip(mids.tolist(), thicknesses.tolist())]
+
+    gridlines = []
+    lines = board.T if by_column else board
+
+    # The scan usually stops within the first lines, so look for mixed lines a block of lines at a time
+    for block_start in range(0, lines.shape[0], SCAN_BLOCK_LINES):
+        block = lines[block_start:block_start + SCAN_BLOCK_LINES]
+
+        # Lines with mixed white and black pixels (not all white), using min/max reductions that don't build
+        # a boolean copy of the block (uint8 pixels are white if 255 and black if 0)
+        mixed = (block.max(axis=1) == 255) & (block.min(axis=1) == 0)
+        for index in block_start + np.flatnonzero(mixed):
+            starts, ends = find_white_runs(lines[index])
+            # Save a gridline in the middle of every group of white pixels
+            gridlines.extend(Gridline(int(mid_position), int(thickness), orientation)
+                             for mid_position, thickness in zip((starts + ends - 1) // 2, ends - starts))
+            if lines[index, -1] == 255:  # The last group of white pixels reaches the end of the line
+                return gridlines
+
+    return gridlines
+
+
+def locate_gridlines(pixels, grid_size, orientation):
+    """
+    Locates the gridlines along a line of pixels crossing a board with a known number of cells per side,
+    checking that there is one group of white pixels close to each expected gridline position.
+
+    Args:
+        pixels (numpy array): A 1D slice of the binary board crossing every gridline of one orientation.
+        grid_size (int): The number of cells per side of the board.
+        orientation (str): The orientation of the located gridlines ("horizontal" or "vertical").
+
+    Returns:
+        list: Gridline objects for the grid_size + 1 gridlines, or None if the gridlines aren't where expected.
+    """
+    starts, ends = find_white_runs(pixels)
+    if len(starts) != grid_size + 1:
+        return None
+
+    mid_positions = (starts + ends - 1) // 2
+    # Expected gridline positions, evenly spaced along the line
+    expected_positions = np.arange(grid_size + 1) * (len(pixels) - 1) // grid_size
+    # Each gridline must be within half a cell of its expected position
+    if np.abs(mid_positions - expected_positions).max() > len(pixels) // (2 * grid_size):
+        return None
+
+    return [Gridline(mid_position, thickness, orientation)
+            for mid_position, thickness in zip(mid_positions.tolist(), (ends - starts).tolist())]
+
+
+def detect_gridlines_fixed(board, grid_size):
+    """
+    Detects the gridlines of a board with a known number of cells per side, reading a single line of pixels
+    per orientation through the middle of the first row (or column) of cells, instead of scanning for mixed lines.
+
+    Args:
+        board (numpy array): The cropped binary image of the game board.
+        grid_size (int): The number of cells per side of the board.
+
+    Returns:
+        tuple: Two lists containing Gridline objects for horizontal and vertical gridlines,
+            or None if the gridlines don't match the grid size.
+    """
+    height, width = board.shape
+    horizontal_gridlines = locate_gridlines(board[height // (2 * grid_size), :], grid_size, 'horizontal')
+    vertical_gridlines = locate_gridlines(board[:, width // (2 * grid_size)], grid_size, 'vertical')
+    if horizontal_gridlines is None or vertical_gridlines is None:
+        return None
+
+    return horizontal_gridlines, vertical_gridlines
+
+
+def detect_gridlines(board, grid_size=None):
     """
     Detects vertical and horizontal gridlines in the binary board image.
 
     Args:
         board (numpy array): The cropped binary image of the game board.
+        grid_size (int, optional): The number of cells per side, if known. The gridlines are then only
+            looked for around their expected positions, falling back to a full scan if they aren't found.
 
     Returns:
         tuple: Two lists containing Gridline objects for horizontal and vertical gridlines.
     """
-    # Initialize lists to store the gridlines
-    horizontal_gridlines = []
-    vertical_gridlines = []
+    # Row scans and reductions (and the compiled scan) need a C-contiguous uint8 board (no-op if it already is)
+    board = np.ascontiguousarray(board, dtype=np.uint8)
+
+    if grid_size:
+        gridlines = detect_gridlines_fixed(board, grid_size)
+        if gridlines is not None:
+            return gridlines
 
     # Detect horizontal gridlines (scan rows)
-    for row in range(board.shape[0]):  # Loop over rows
-        # Check for mixed white and black pixels (not all white)
-        if np.any(board[row, :] == 255) and np.any(board[row, :] == 0):  # Mixed white and black
-            # Look for groups of white pixels
-            start = None
-            thickness = 0
-            for col in range(board.shape[1]):
-                if board[row, col] == 255:  # White pixel
-                    if start is None:
-                        start = col
-                    thickness += 1
-                else:
-                    if start is not None:
-                        # We have a group of white pixels, save the gridline in the middle
-                        mid_position = (start + col - 1) // 2  # Middle pixel
-                        horizontal_gridlines.append(Gridline(mid_position, thickness, 'horizontal'))
-                        start = None
-                        thickness = 0
-            if start is not None:  # Last group of white pixels in the row
-                mid_position = (start + board.shape[1] - 1) // 2
-                horizontal_gridlines.append(Gridline(mid_position, thickness, 'horizontal'))
-                break
+    horizontal_gridlines = scan_gridlines(board, 'horizontal')
 
     # Detect vertical gridlines (scan columns)
-    for col in range(board.shape[1]):  # Loop over columns
-        # Check for mixed white and black pixels (not all white)
-        if np.any(board[col, :] == 255) and np.any(board[col, :] == 0):  # Mixed white and black
-            # Look for groups of white pixels
-            start = None
-            thickness = 0
-            for row in range(board.shape[0]):
-                if board[row, col] == 255:  # White pixel
-                    if start is None:
-                        start = row
-                    thickness += 1
-                else:
-                    if start is not None:
-                        # We have a group of white pixels, save the gridline in the middle
-                        mid_position = (start + row - 1) // 2  # Middle pixel
-                        vertical_gridlines.append(Gridline(mid_position, thickness, 'vertical'))
-                        start = None
-                        thickness = 0
-            if start is not None:  # Last group of white pixels in the column
-                mid_position = (start + board.shape[0] - 1) // 2
-                vertical_gridlines.append(Gridline(mid_position, thickness, 'vertical'))
-                break
+    vertical_gridlines = scan_gridlines(board, 'vertical')
 
     return horizontal_gridlines, vertical_gridlines
 
@@ -246,21 +463,17 @@ def compute_cell_coordinates(rows, cols, x, y):
     Returns:
         list: A list of Cell objects representing each cell's position and size.
     """
-    cells = []
+    row_positions = np.array([gridline.position for gridline in rows], dtype=np.intp)
+    col_positions = np.array([gridline.position for gridline in cols], dtype=np.intp)
 
     # Assuming cells are square-shaped, so width = height
-    for i in range(len(rows) - 1):
-        for j in range(len(cols) - 1):
-            # Top-left corner (x, y) for each cell
-            cell_x = cols[j].position
-            cell_y = rows[i].position
-
-            # The size of the cell is determined by the distance between consecutive gridlines
-            cell_size = min(cols[j + 1].position - cols[j].position, rows[i + 1].position - rows[i].position)
+    # The size of each cell is determined by the distance between consecutive gridlines
+    cell_sizes = np.minimum(np.diff(row_positions)[:, None], np.diff(col_positions)[None, :])
 
-            # Create a Cell object with the position and size
-            cell = Cell.from_top_left((cell_x, cell_y), cell_size)
-            cells.append(cell)
+    # Create a Cell object for each (row, column) pair, with its top-left corner (x, y) on the gridlines
+    cells = [Cell.from_top_left((cell_x, cell_y), cell_size)
+             for cell_y, row_sizes in zip(row_positions.tolist(), cell_sizes.tolist())
+             for cell_x, cell_size in zip(col_positions.tolist(), row_sizes)]
 
     return cells
 
@@ -278,29 +491,28 @@ def color_cells(original_image, cells, x, y):
     Returns:
         list: List of Cell objects with updated color information.
     """
-    for cell in cells:
-        # Adjust the cell position from the cropped image to the original image
-        cell_x = cell.x + x
-        cell_y = cell.y + y
-
-        # Get the color of the pixel at (cell_x, cell_y) from the original image
-        bgr_color = original_image[cell_y, cell_x]  # Color is in BGR format
+    # Adjust the cell positions from the cropped image to the original image
+    cell_xs = np.fromiter((cell.x for cell in cells), dtype=np.intp, count=len(cells)) + x
+    cell_ys = np.fromiter((cell.y for cell in cells), dtype=np.intp, count=len(cells)) + y
 
-        # Convert BGR to RGB
-        rgb_color = (bgr_color[2], bgr_color[1], bgr_color[0])
+    # Get the color of the pixels at (cell_x, cell_y) from the original image in one read,
+    # converting BGR to RGB by reversing the channels
+    rgb_colors = original_image[cell_ys, cell_xs, ::-1].tolist()
 
-        # Set the color of the cell
-        cell.set_color(rgb_color)
+    # Set the color of each cell
+    for cell, rgb_color in zip(cells, rgb_colors):
+        cell.set_color(tuple(rgb_color))
 
     return cells
 
 
-def detect_game_board(image_path: Path, grid_area, save_intermediate=False):
+def detect_game_board(image, grid_area, save_intermediate=False):
     """
     Detects the game board grid from a screenshot image and optionally saves intermediate images.
 
     Args:
-        image_path (str): Path to the image file.
+        image (str, Path or numpy array): Path to the image file, or the image itself in BGR format
+            (e.g. as returned by `capture_screenshot_of_grid`).
         grid_area (tuple): The (x, y, w, h) coordinates of the grid area on the screen.
         save_intermediate (bool): Whether to save intermediate images.
 
@@ -313,7 +525,7 @@ def detect_game_board(image_path: Path, grid_area, save_intermediate=False):
               - "columns": Number of columns in the grid.
     """
     # Step 1: Load and preprocess the image
-    img, binary = load_and_preprocess_image(image_path, save_intermediate)
+    img, binary = load_and_preprocess_image(image, save_intermediate)
 
     # Step 2: Find the game board
     x, y, w, h, cropped_binary = find_game_board(binary, save_intermediate)
@@ -326,7 +538,7 @@ def detect_game_board(image_path: Path, grid_area, save_intermediate=False):
     board = normalize_grid(cropped_binary)
 
     # Step 3: Detect gridlines
-    rows, cols = detect_gridlines(board)
+    rows, cols = detect_gridlines(board, get_setting("board_detection.grid_size"))
 
     # Step 4: Compute cell coordinates
     cells = compute_cell_coordinates(rows, cols, x, y)
@@ -0,0 +1,25 @@
+import numpy as np
+
+from utils.jit import JIT_ENABLED
+from utils.logic import find_matching_entries
+from utils.screen import scan_gridlines
+
+
+def warmup_jit():
+    """
+    Compiles the Numba kernels by running them on minimal inputs, so the first solve doesn't pay the compilation cost.
+    Kernels are compiled with cache=True, so only the first warmup after an install or code change is slow.
+    """
+    if not JIT_ENABLED:
+        return
+
+    # Bitmask search used by the solver's rules (utils.logic._search)
+    find_matching_entries({"warmup": ["value"]}, 1)
+
+    # Gridline scan used by the board detection (utils.screen._scan_runs)
+    scan_gridlines(np.array([[255, 0]], dtype=np.uint8), 'horizontal')
+
+
+if __name__ == "__main__":
+    warmup_jit()
+    print("JIT kernels compiled." if JIT_ENABLED else "Numba is not installed, nothing to compile.")